@@ -0,0 +1,95 @@
+"""store numeric SWAPI fields as numbers
+
+Revision ID: 3c9d5e27b1f0
+Revises: fa1ae04aa443
+Create Date: 2026-10-14 10:31:47.902114
+
+"""
+import re
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9d5e27b1f0'
+down_revision = 'fa1ae04aa443'
+branch_labels = None
+depends_on = None
+
+
+# (tabla, columna, tipo anterior, tipo nuevo)
+NUMERIC_COLUMNS = [
+    ('planets', 'diameter', sa.String(length=40), sa.Integer()),
+    ('planets', 'rotation_period', sa.String(length=40), sa.Integer()),
+    ('planets', 'orbital_period', sa.String(length=40), sa.Integer()),
+    ('planets', 'population', sa.String(length=40), sa.BigInteger()),
+    ('planets', 'surface_water', sa.String(length=40), sa.Float()),
+    ('people', 'height', sa.String(length=20), sa.Integer()),
+    ('people', 'mass', sa.String(length=20), sa.Float()),
+    ('vehicles', 'cost_in_credits', sa.String(length=40), sa.BigInteger()),
+    ('vehicles', 'length', sa.String(length=20), sa.Float()),
+    ('vehicles', 'max_atmosphering_speed', sa.String(length=40), sa.Integer()),
+    ('vehicles', 'crew', sa.String(length=40), sa.Integer()),
+    ('vehicles', 'passengers', sa.String(length=40), sa.Integer()),
+    ('vehicles', 'cargo_capacity', sa.String(length=40), sa.BigInteger()),
+]
+
+SQL_TYPES = {sa.Integer: 'integer', sa.BigInteger: 'bigint', sa.Float: 'double precision'}
+
+# Copia de models.SWAPI_UNKNOWN en el momento de esta migración: la migración no importa
+# la aplicación, para que volver a ejecutar el historial no cambie si cambia models.py.
+SWAPI_UNKNOWN = ("unknown", "n/a", "none", "")
+
+# Lo que el CAST de cada tipo acepta sin perder información. SQLite trunca en silencio
+# lo que no encaja ('5.5' -> 5, '30-165' -> 30) y PostgreSQL aborta; se comprueba antes.
+NUMBER_PATTERNS = {
+    sa.Integer: re.compile(r'[+-]?\d+'),
+    sa.BigInteger: re.compile(r'[+-]?\d+'),
+    sa.Float: re.compile(r'[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?'),
+}
+
+
+def _check_numbers():
+    """Falla listando las filas cuyo valor no es un número válido para el tipo nuevo."""
+    if context.is_offline_mode():
+        return
+    bind = op.get_bind()
+    invalid = []
+    for table, column, old_type, new_type in NUMERIC_COLUMNS:
+        pattern = NUMBER_PATTERNS[type(new_type)]
+        rows = bind.execute(sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL"))
+        invalid += [f"{table}.{column} id={row_id}: {value!r}"
+                    for row_id, value in rows if not pattern.fullmatch(value)]
+    if invalid:
+        raise RuntimeError(
+            "Valores no numéricos; corrígelos o ponlos a NULL antes de migrar:\n  "
+            + "\n  ".join(invalid))
+
+
+def upgrade():
+    # Los valores de SWAPI_UNKNOWN (sin distinguir mayúsculas ni espacios) pasan a NULL y
+    # se quitan los separadores de miles ("1,358"), con UPDATE portables. Lo que quede y no
+    # sea un número válido para el tipo nuevo detiene la migración antes de cambiar tipos.
+    unknown = ", ".join(f"'{value}'" for value in SWAPI_UNKNOWN)
+    for table, column, old_type, new_type in NUMERIC_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = NULL WHERE lower(trim({column})) IN ({unknown})")
+        op.execute(f"UPDATE {table} SET {column} = replace(trim({column}), ',', '') WHERE {column} IS NOT NULL")
+    _check_numbers()
+    for table, column, old_type, new_type in NUMERIC_COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                   existing_type=old_type,
+                   type_=new_type,
+                   existing_nullable=True,
+                   postgresql_using=f"{column}::{SQL_TYPES[type(new_type)]}")
+
+
+def downgrade():
+    for table, column, old_type, new_type in reversed(NUMERIC_COLUMNS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                   existing_type=new_type,
+                   type_=old_type,
+                   existing_nullable=True,
+                   postgresql_using=f"{column}::varchar")
@@ -0,0 +1,26 @@
+"""case-insensitive unique index on users.email
+
+Revision ID: 5f08e9c3d6b2
+Revises: d21c6f8a4e73
+Create Date: 2026-10-14 12:27:41.290553
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f08e9c3d6b2'
+down_revision = 'd21c6f8a4e73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Normaliza los emails existentes; falla si ya hay duplicados que solo difieren en mayúsculas
+    op.execute("UPDATE users SET email = lower(email)")
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,55 @@
+"""delete favorites and homeworld references at the FK level
+
+Revision ID: 8e4b02d6c7a9
+Revises: 3c9d5e27b1f0
+Create Date: 2026-10-14 11:12:03.551870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b02d6c7a9'
+down_revision = '3c9d5e27b1f0'
+branch_labels = None
+depends_on = None
+
+
+# (tabla, columna, tabla referenciada, ondelete)
+FOREIGN_KEYS = [
+    ('favorite_planets', 'user_id', 'users', 'CASCADE'),
+    ('favorite_planets', 'planet_id', 'planets', 'CASCADE'),
+    ('favorite_people', 'user_id', 'users', 'CASCADE'),
+    ('favorite_people', 'person_id', 'people', 'CASCADE'),
+    ('favorite_vehicles', 'user_id', 'users', 'CASCADE'),
+    ('favorite_vehicles', 'vehicle_id', 'vehicles', 'CASCADE'),
+    ('people', 'homeworld_id', 'planets', 'SET NULL'),
+]
+
+
+# La migración inicial creó estas FK sin nombre: PostgreSQL las llama <tabla>_<columna>_fkey,
+# MySQL <tabla>_ibfk_N y SQLite no les da nombre. Se busca el nombre real por reflexión y,
+# si no hay (SQLite), batch_alter_table le asigna uno con esta convención para poder borrarla.
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+
+
+def _recreate_foreign_keys(with_ondelete):
+    inspector = sa.inspect(op.get_bind())
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        current_name = next(
+            (fk['name'] for fk in inspector.get_foreign_keys(table) if fk['constrained_columns'] == [column]),
+            None,
+        ) or f'fk_{table}_{column}_{referent}'
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(current_name, type_='foreignkey')
+            batch_op.create_foreign_key(f'{table}_{column}_fkey', referent, [column], ['id'],
+                                        ondelete=ondelete if with_ondelete else None)
+
+
+def upgrade():
+    _recreate_foreign_keys(with_ondelete=True)
+
+
+def downgrade():
+    _recreate_foreign_keys(with_ondelete=False)
@@ -0,0 +1,67 @@
+"""replace users.subscription_date with subscription_epoch
+
+Revision ID: c3f72d19a8e6
+Revises: 9a6e1b47f0c5
+Create Date: 2026-10-14 13:14:52.083617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f72d19a8e6'
+down_revision = '9a6e1b47f0c5'
+branch_labels = None
+depends_on = None
+
+
+# En SQLite, batch_alter_table recrea la tabla users y no conserva los índices de
+# expresión: ix_users_email_lower (lower(email)) se quita antes y se vuelve a crear después.
+def _drop_email_lower_index():
+    op.drop_index('ix_users_email_lower', table_name='users')
+
+
+def _create_email_lower_index():
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+# Conversión fecha <-> segundos epoch según el motor: (a epoch, desde epoch)
+EPOCH_SQL = {
+    'postgresql': ("EXTRACT(EPOCH FROM subscription_date)::bigint", "to_timestamp(subscription_epoch)"),
+    'sqlite': ("CAST(strftime('%s', subscription_date) AS INTEGER)", "datetime(subscription_epoch, 'unixepoch')"),
+    'mysql': ("UNIX_TIMESTAMP(subscription_date)", "FROM_UNIXTIME(subscription_epoch)"),
+}
+
+
+def _epoch_sql(direction):
+    dialect = op.get_bind().dialect.name
+    if dialect not in EPOCH_SQL:
+        raise NotImplementedError(f"Migración sin conversión de fechas para el motor '{dialect}'")
+    return EPOCH_SQL[dialect][direction]
+
+
+def upgrade():
+    to_epoch = _epoch_sql(0)
+    op.add_column('users', sa.Column('subscription_epoch', sa.BigInteger(), nullable=True))
+    op.execute(f"UPDATE users SET subscription_epoch = {to_epoch}")
+    _drop_email_lower_index()
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('subscription_epoch', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_users_subscription_epoch'), ['subscription_epoch'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_users_subscription_date'))
+        batch_op.drop_column('subscription_date')
+    _create_email_lower_index()
+
+
+def downgrade():
+    from_epoch = _epoch_sql(1)
+    op.add_column('users', sa.Column('subscription_date', sa.DateTime(timezone=True), nullable=True))
+    op.execute(f"UPDATE users SET subscription_date = {from_epoch}")
+    _drop_email_lower_index()
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('subscription_date', existing_type=sa.DateTime(timezone=True), nullable=False)
+        batch_op.create_index(batch_op.f('ix_users_subscription_date'), ['subscription_date'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_users_subscription_epoch'))
+        batch_op.drop_column('subscription_epoch')
+    _create_email_lower_index()
@@ -3,6 +3,14 @@ from flask_admin import Admin
 from models import db, User
 from flask_admin.contrib.sqla import ModelView
 
+class UserView(ModelView):
+    # password guarda el hash bcrypt en bytes: Flask-Admin lo convierte en un TextAreaField
+    # que envía str y mostraría el hash como b'...'. Se oculta del listado y del formulario,
+    # y sin contraseña no se puede crear un usuario desde aquí (la columna es NOT NULL).
+    column_exclude_list = ["password"]
+    form_excluded_columns = ["password"]
+    can_create = False
+
 def setup_admin(app):
     app.secret_key = os.environ.get('FLASK_APP_KEY', 'sample key')
     app.config['FLASK_ADMIN_SWATCH'] = 'cerulean'
@@ -10,7 +18,7 @@ def setup_admin(app):
 
     
     # Add your models here, for example this is how we add a the User model to the admin
-    admin.add_view(ModelView(User, db.session))
+    admin.add_view(UserView(User, db.session))
 
     # You can duplicate that line to add mew models
     # admin.add_view(ModelView(YourModelName, db.session))
\ No newline at end of file
@@ -1,11 +1,16 @@
 # src/models.py
 # Importaciones necesarias de Flask-SQLAlchemy y SQLAlchemy
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import event, String, Integer, BigInteger, Float, LargeBinary, ForeignKey, Boolean, Index, select, inspect, bindparam, lambda_stmt
+from sqlalchemy.orm import Bundle, Mapped, Session, mapped_column, relationship, selectinload, joinedload, lazyload, raiseload, defer, validates
+from sqlalchemy.engine import Engine
 from sqlalchemy.sql import func
-from datetime import datetime
-from typing import List # Para type hints en relaciones
+from datetime import datetime, timezone
+import sqlite3
+import time
+from functools import lru_cache
+from typing import List, Optional # Para type hints en relaciones
+import msgspec
 
 # Inicialización de la extensión SQLAlchemy.
 # En tu aplicación Flask, deberías inicializarla así:
@@ -16,6 +21,86 @@ from typing import List # Para type hints en relaciones
 # Por ahora, solo creamos la instancia base:
 db = SQLAlchemy()
 
+# SQLite no aplica las claves foráneas (ni sus ondelete) salvo que se active en cada
+# conexión; sin esto el fallback sqlite:////tmp/test.db dejaría favoritos y homeworld_id
+# apuntando a filas borradas, porque las relaciones usan passive_deletes=True.
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+# Valores que SWAPI usa para "sin dato" en los campos numéricos; se guardan como NULL.
+SWAPI_UNKNOWN = ("unknown", "n/a", "none", "")
+
+def _swapi_number(column_type, value):
+    """Convierte un número de SWAPI ("1,358", "unknown"...) al tipo Python de la columna."""
+    if isinstance(value, str):
+        value = value.replace(",", "").strip()
+        if value.lower() in SWAPI_UNKNOWN:
+            return None
+    if value is None:
+        return None
+    number = column_type.python_type(value)
+    if not isinstance(value, str) and number != value:
+        # int(3.7) daría 3 en silencio: en columnas enteras solo se aceptan valores enteros
+        raise ValueError(f"{value!r} no es un valor válido para {column_type}")
+    return number
+
+def _make_serializer(cls, fields, name="serialize", factory=None):
+    """
+    Genera en tiempo de importación un método que devuelve el diccionario literal
+    {"campo": self.atributo, ...} con la lista de campos ya fija, y lo asigna a cls.
+    Cada campo es un nombre de atributo o una tupla (clave, atributo).
+    Con factory, el método devuelve factory(campo=self.atributo, ...) en lugar del diccionario.
+    """
+    pairs = [(f, f) if isinstance(f, str) else f for f in fields]
+    if factory is None:
+        body = "{" + ", ".join(f"{key!r}: self.{attr}" for key, attr in pairs) + "}"
+        doc = f"Convierte el objeto {cls.__name__} a un diccionario simple (generado por _make_serializer)."
+    else:
+        body = "_factory(" + ", ".join(f"{key}=self.{attr}" for key, attr in pairs) + ")"
+        doc = f"Convierte el objeto {cls.__name__} a {factory.__name__} (generado por _make_serializer)."
+    namespace = {"_factory": factory}
+    exec(f"def {name}(self):\n    return {body}\n", namespace)
+    method = namespace[name]
+    method.__qualname__ = f"{cls.__name__}.{name}"
+    method.__doc__ = doc
+    setattr(cls, name, method)
+    return method
+
+# --- Tablas de Asociación para Favoritos ---
+# Solo guardan las dos claves foráneas, por eso son tablas Core (db.Table) usadas como
+# "secondary" en las relaciones Muchos-a-Muchos: no hay instancias ORM por fila.
+# El PK (user_id, X_id) ya cubre "WHERE user_id = ?"; el índice cubre la búsqueda inversa.
+# ondelete="CASCADE": al borrar un usuario o un recurso la base de datos elimina sus filas
+# de favoritos en un solo DELETE; las relaciones usan passive_deletes=True para que el ORM
+# no cargue las colecciones solo para borrarlas. Ojo: User.favorite_* son lazy="selectin",
+# así que al borrar un usuario cargado el ORM sí borra él mismo las filas de las colecciones
+# ya cargadas; el CASCADE de la base de datos cubre el resto (p. ej. al borrar un planeta).
+
+favorite_planets_table = db.Table(
+    "favorite_planets",
+    db.Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("planet_id", Integer, ForeignKey("planets.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_fav_planet_planet_id", "planet_id"),
+)
+
+favorite_people_table = db.Table(
+    "favorite_people",
+    db.Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("person_id", Integer, ForeignKey("people.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_fav_person_person_id", "person_id"),
+)
+
+favorite_vehicles_table = db.Table(
+    "favorite_vehicles",
+    db.Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("vehicle_id", Integer, ForeignKey("vehicles.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_fav_vehicle_vehicle_id", "vehicle_id"),
+)
+
 # --- Definición de Modelos ---
 
 class User(db.Model):
@@ -26,39 +111,156 @@ class User(db.Model):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(String(120), unique=True, nullable=False)
-    password: Mapped[str] = mapped_column(String(200), nullable=False) # Guardar hash de contraseña, no texto plano
+    password: Mapped[bytes] = mapped_column(LargeBinary(60), nullable=False) # Hash bcrypt en bytes tal como lo devuelve bcrypt.hashpw, sin base64/hex; nunca texto plano
     first_name: Mapped[str] = mapped_column(String(80), nullable=True)
     last_name: Mapped[str] = mapped_column(String(80), nullable=True)
-    subscription_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    is_active: Mapped[bool] = mapped_column(Boolean(), default=True, nullable=False) # Campo opcional para activar/desactivar usuarios
+    # Fecha de suscripción en segundos epoch (UTC): se serializa como entero, sin construir
+    # objetos datetime ni formatear strings. Valor por defecto calculado en Python: el INSERT
+    # ya lleva la fecha y no hace falta RETURNING (permite inserciones masivas). Indexada
+    # para consultas por rango.
+    subscription_epoch: Mapped[int] = mapped_column(BigInteger, default=lambda: int(time.time()), index=True, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean(), default=True, server_default="1", nullable=False) # Campo opcional para activar/desactivar usuarios
 
     # --- Relaciones ---
-    # Relación con los planetas favoritos del usuario (a través de FavoritePlanet)
-    favorite_planets: Mapped[List["FavoritePlanet"]] = relationship("FavoritePlanet", back_populates="user", cascade="all, delete-orphan")
-    # Relación con los personajes favoritos del usuario (a través de FavoritePerson)
-    favorite_people: Mapped[List["FavoritePerson"]] = relationship("FavoritePerson", back_populates="user", cascade="all, delete-orphan")
-    # Relación con los vehículos favoritos del usuario (a través de FavoriteVehicle) - NUEVO
-    favorite_vehicles: Mapped[List["FavoriteVehicle"]] = relationship("FavoriteVehicle", back_populates="user", cascade="all, delete-orphan")
+    # lazy="selectin": al cargar varios usuarios, los favoritos se traen en una sola
+    # consulta "WHERE user_id IN (...)" por relación, en lugar de una por usuario.
+    # Relación con los planetas favoritos del usuario (a través de favorite_planets)
+    favorite_planets: Mapped[List["Planet"]] = relationship("Planet", secondary=favorite_planets_table, back_populates="favorited_by", lazy="selectin", passive_deletes=True)
+    # Relación con los personajes favoritos del usuario (a través de favorite_people)
+    favorite_people: Mapped[List["Person"]] = relationship("Person", secondary=favorite_people_table, back_populates="favorited_by", lazy="selectin", passive_deletes=True)
+    # Relación con los vehículos favoritos del usuario (a través de favorite_vehicles) - NUEVO
+    favorite_vehicles: Mapped[List["Vehicle"]] = relationship("Vehicle", secondary=favorite_vehicles_table, back_populates="favorited_by", lazy="selectin", passive_deletes=True)
 
 
     def __repr__(self):
         return f'<User {self.email}>'
 
-    def serialize(self):
-        """Convierte el objeto User a un diccionario simple."""
-        # Nota: Nunca serializar la contraseña.
-        return {
-            "id": self.id,
-            "email": self.email,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "subscription_date": self.subscription_date.isoformat() if self.subscription_date else None,
-            "is_active": self.is_active,
-            # Incluimos listas de IDs de favoritos
-            "favorite_planet_ids": [fav.planet_id for fav in self.favorite_planets], # ojo esto es un bucle hay que estudiar mas 
-            "favorite_person_ids": [fav.person_id for fav in self.favorite_people],
-            "favorite_vehicle_ids": [fav.vehicle_id for fav in self.favorite_vehicles] # NUEVO
-        }
+    @validates("email")
+    def _normalize_email(self, key, value):
+        # Se guarda en minúsculas: la unicidad no distingue mayúsculas y las búsquedas
+        # usan el índice con un simple "email = ?"
+        return value.lower() if value is not None else value
+
+    @validates("password")
+    def _check_password_hash(self, key, value):
+        # Solo se guarda el hash tal como lo devuelve bcrypt.hashpw(); un str sería texto
+        # plano o un hash ya codificado y fallaría después en el INSERT con un error confuso
+        if isinstance(value, str):
+            raise TypeError("User.password debe ser el hash bcrypt en bytes, no str")
+        return value
+
+    @classmethod
+    def get_by_email(cls, email):
+        """
+        Busca un usuario por email sin distinguir mayúsculas (p. ej. en el login).
+        Una sola consulta: los favoritos (lazy="selectin") no se cargan salvo que se usen.
+        """
+        if email is None:
+            return None
+        stmt = select(cls).options(lazyload("*")).where(cls.email == email.lower())
+        return db.session.scalar(stmt)
+
+    @property
+    def subscription_date_iso(self):
+        """subscription_epoch en formato ISO (UTC), solo para quien lo necesite; serialize() no lo usa."""
+        if self.subscription_epoch is None:
+            return None
+        return datetime.fromtimestamp(self.subscription_epoch, timezone.utc).isoformat()
+
+    def serialize(self, fav_planet_ids=None, fav_person_ids=None, fav_vehicle_ids=None):
+        """
+        Convierte el objeto User a un diccionario simple.
+        Si se serializan muchos usuarios, el llamador puede pasar las listas de IDs
+        de favoritos ya agrupadas para evitar las consultas por usuario.
+        """
+        if fav_planet_ids is None:
+            fav_planet_ids = self._favorite_ids("favorite_planets", favorite_planets_table.c.planet_id, favorite_planets_table.c.user_id)
+        if fav_person_ids is None:
+            fav_person_ids = self._favorite_ids("favorite_people", favorite_people_table.c.person_id, favorite_people_table.c.user_id)
+        if fav_vehicle_ids is None:
+            fav_vehicle_ids = self._favorite_ids("favorite_vehicles", favorite_vehicles_table.c.vehicle_id, favorite_vehicles_table.c.user_id)
+        data = self._serialize_columns()
+        # Incluimos listas de IDs de favoritos
+        data["favorite_planet_ids"] = list(fav_planet_ids)
+        data["favorite_person_ids"] = list(fav_person_ids)
+        data["favorite_vehicle_ids"] = list(fav_vehicle_ids) # NUEVO
+        return data
+
+    def _favorite_ids(self, relationship_name, id_column, user_column):
+        """
+        IDs de una relación de favoritos: si la colección ya está cargada (selectin)
+        se leen de ahí; si no, se consulta solo la columna FK.
+        """
+        if relationship_name not in inspect(self).unloaded:
+            return [obj.id for obj in getattr(self, relationship_name)]
+        return db.session.scalars(select(id_column).where(user_column == self.id)).all()
+
+    @classmethod
+    def loader_default(cls):
+        """
+        Opciones de carga para las consultas de la API: favoritos en selectin y
+        raiseload("*") para que cualquier otra relación no prevista lance un error
+        en lugar de disparar consultas N+1. Uso: select(User).options(*User.loader_default())
+        """
+        return [
+            selectinload(cls.favorite_planets),
+            selectinload(cls.favorite_people),
+            selectinload(cls.favorite_vehicles),
+            raiseload("*"),
+        ]
+
+    @classmethod
+    def list_with_favs(cls):
+        """
+        Serializa todos los usuarios con una sola consulta: cada lista de favoritos se
+        agrega en la base de datos (array_agg en PostgreSQL, group_concat en SQLite/MySQL)
+        y se pasa a serialize(), así no se disparan las cargas selectin por relación.
+        """
+        postgres = db.session.get_bind().dialect.name == "postgresql"
+
+        def aggregated_ids(table, id_column_name):
+            column = table.c[id_column_name]
+            aggregate = func.array_agg(column) if postgres else func.group_concat(column)
+            return select(aggregate).where(table.c.user_id == cls.id).scalar_subquery()
+
+        def as_id_list(value):
+            if value is None:
+                return []
+            if isinstance(value, str): # group_concat devuelve "1,2,3"
+                return [int(item) for item in value.split(",")]
+            return value
+
+        stmt = select(
+            cls,
+            aggregated_ids(favorite_planets_table, "planet_id"),
+            aggregated_ids(favorite_people_table, "person_id"),
+            aggregated_ids(favorite_vehicles_table, "vehicle_id"),
+        ).options(raiseload("*")).order_by(cls.id)
+        return [
+            user.serialize(as_id_list(planet_ids), as_id_list(person_ids), as_id_list(vehicle_ids))
+            for user, planet_ids, person_ids, vehicle_ids in db.session.execute(stmt)
+        ]
+
+    @classmethod
+    def get_with_favorites(cls, user_id):
+        """Carga un usuario con sus tres relaciones de favoritos en consultas selectin."""
+        stmt = select(cls).options(*cls.loader_default()).where(cls.id == user_id)
+        return db.session.scalar(stmt)
+
+    @classmethod
+    def serialize_with_favorites(cls, user_id):
+        """Devuelve el usuario serializado (o None si no existe)."""
+        user = cls.get_with_favorites(user_id)
+        return user.serialize() if user else None
+
+# Unicidad del email sin distinguir mayúsculas, también para filas insertadas sin pasar por el ORM
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+
+# Nota: Nunca serializar la contraseña.
+_make_serializer(User, (
+    "id", "email", "first_name", "last_name",
+    "subscription_epoch", "is_active",
+), name="_serialize_columns")
 
 class Planet(db.Model):
     """
@@ -69,39 +271,56 @@ class Planet(db.Model):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    diameter: Mapped[str] = mapped_column(String(40), nullable=True)
-    rotation_period: Mapped[str] = mapped_column(String(40), nullable=True)
-    orbital_period: Mapped[str] = mapped_column(String(40), nullable=True)
+    diameter: Mapped[int] = mapped_column(Integer, nullable=True)
+    rotation_period: Mapped[int] = mapped_column(Integer, nullable=True)
+    orbital_period: Mapped[int] = mapped_column(Integer, nullable=True)
     gravity: Mapped[str] = mapped_column(String(40), nullable=True)
-    population: Mapped[str] = mapped_column(String(40), nullable=True)
+    population: Mapped[int] = mapped_column(BigInteger, nullable=True)
     climate: Mapped[str] = mapped_column(String(100), nullable=True)
     terrain: Mapped[str] = mapped_column(String(100), nullable=True)
-    surface_water: Mapped[str] = mapped_column(String(40), nullable=True)
+    surface_water: Mapped[float] = mapped_column(Float, nullable=True)
+
+    @validates("diameter", "rotation_period", "orbital_period", "population", "surface_water")
+    def _validate_numbers(self, key, value):
+        return _swapi_number(self.__table__.c[key].type, value)
 
     # --- Relaciones ---
     # Relación con los usuarios que han marcado este planeta como favorito
-    favorited_by: Mapped[List["FavoritePlanet"]] = relationship("FavoritePlanet", back_populates="planet", cascade="all, delete-orphan")
+    favorited_by: Mapped[List["User"]] = relationship("User", secondary=favorite_planets_table, back_populates="favorite_planets", passive_deletes=True)
     # Relación con los personajes que tienen este planeta como hogar (homeworld)
-    residents: Mapped[List["Person"]] = relationship("Person", back_populates="homeworld")
+    residents: Mapped[List["Person"]] = relationship("Person", back_populates="homeworld", passive_deletes=True)
 
     def __repr__(self):
         return f'<Planet {self.name}>'
 
-    def serialize(self):
-        """Convierte el objeto Planet a un diccionario simple."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "diameter": self.diameter,
-            "rotation_period": self.rotation_period,
-            "orbital_period": self.orbital_period,
-            "gravity": self.gravity,
-            "population": self.population,
-            "climate": self.climate,
-            "terrain": self.terrain,
-            "surface_water": self.surface_water,
-            "resident_ids": [resident.id for resident in self.residents]
-        }
+    @classmethod
+    def loader_default(cls):
+        """Opciones de carga para la API: resident_ids no necesita cargar residents, se prohíben todas."""
+        return [raiseload("*")]
+
+    @classmethod
+    def loader_list(cls):
+        """
+        Opciones para listados que solo muestran id/nombre y no llaman a serialize():
+        climate y terrain no se piden (SELECT más estrecho). Acceder a ellos lanza un
+        error en lugar de lanzar una consulta por fila; serialize() necesita loader_default().
+        """
+        return [defer(cls.climate, raiseload=True), defer(cls.terrain, raiseload=True), raiseload("*")]
+
+    @property
+    def resident_ids(self):
+        """
+        IDs de los personajes que tienen este planeta como hogar. Si residents ya está
+        cargado se reutiliza; si no, se consulta solo people.id en vez de filas completas.
+        """
+        if "residents" not in inspect(self).unloaded:
+            return [resident.id for resident in self.residents]
+        return db.session.scalars(select(Person.id).where(Person.homeworld_id == self.id)).all()
+
+_make_serializer(Planet, (
+    "id", "name", "diameter", "rotation_period", "orbital_period", "gravity",
+    "population", "climate", "terrain", "surface_water", "resident_ids",
+))
 
 class Person(db.Model):
     """
@@ -109,41 +328,54 @@ class Person(db.Model):
     Basado en la estructura de SWAPI.
     """
     __tablename__ = "people"
+    # Índice cubriente para Planet.resident_ids ("SELECT id ... WHERE homeworld_id = ?"):
+    # la consulta se resuelve solo con el índice, sin leer las filas de people.
+    __table_args__ = (Index("ix_person_homeworld_id_id", "homeworld_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
-    height: Mapped[str] = mapped_column(String(20), nullable=True)
-    mass: Mapped[str] = mapped_column(String(20), nullable=True)
+    height: Mapped[int] = mapped_column(Integer, nullable=True)
+    mass: Mapped[float] = mapped_column(Float, nullable=True)
     hair_color: Mapped[str] = mapped_column(String(50), nullable=True)
     skin_color: Mapped[str] = mapped_column(String(50), nullable=True)
     eye_color: Mapped[str] = mapped_column(String(50), nullable=True)
     birth_year: Mapped[str] = mapped_column(String(20), nullable=True)
     gender: Mapped[str] = mapped_column(String(20), nullable=True)
 
+    @validates("height", "mass")
+    def _validate_numbers(self, key, value):
+        return _swapi_number(self.__table__.c[key].type, value)
+
     # --- Claves Foráneas ---
-    homeworld_id: Mapped[int] = mapped_column(Integer, ForeignKey("planets.id"), nullable=True)
+    # ondelete="SET NULL": al borrar un planeta la base de datos deja sin homeworld a sus residentes
+    homeworld_id: Mapped[int] = mapped_column(Integer, ForeignKey("planets.id", ondelete="SET NULL"), nullable=True)
 
     # --- Relaciones ---
     homeworld: Mapped["Planet"] = relationship("Planet", back_populates="residents")
-    favorited_by: Mapped[List["FavoritePerson"]] = relationship("FavoritePerson", back_populates="person", cascade="all, delete-orphan")
+    favorited_by: Mapped[List["User"]] = relationship("User", secondary=favorite_people_table, back_populates="favorite_people", passive_deletes=True)
 
     def __repr__(self):
         return f'<Person {self.name}>'
 
-    def serialize(self):
-        """Convierte el objeto Person a un diccionario simple."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "height": self.height,
-            "mass": self.mass,
-            "hair_color": self.hair_color,
-            "skin_color": self.skin_color,
-            "eye_color": self.eye_color,
-            "birth_year": self.birth_year,
-            "gender": self.gender,
-            "homeworld_id": self.homeworld_id,
-        }
+    @classmethod
+    def loader_default(cls):
+        """Opciones de carga para la API: serialize() solo usa columnas, ninguna relación."""
+        return [raiseload("*")]
+
+    @classmethod
+    def loader_with_homeworld(cls):
+        """
+        Para listados que muestran el planeta de cada personaje: trae homeworld en el mismo
+        SELECT con un JOIN (outer, porque homeworld_id es opcional) en vez de N consultas.
+        No es la carga por defecto: la mayoría de endpoints solo usan homeworld_id.
+        Uso: select(Person).options(*Person.loader_with_homeworld())
+        """
+        return [joinedload(cls.homeworld, innerjoin=False)]
+
+_make_serializer(Person, (
+    "id", "name", "height", "mass", "hair_color", "skin_color",
+    "eye_color", "birth_year", "gender", "homeworld_id",
+))
 
 # --- NUEVO: Modelo Vehicle ---
 class Vehicle(db.Model):
@@ -157,114 +389,209 @@ class Vehicle(db.Model):
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     model: Mapped[str] = mapped_column(String(100), nullable=False)
     manufacturer: Mapped[str] = mapped_column(String(200), nullable=False)
-    cost_in_credits: Mapped[str] = mapped_column(String(40), nullable=True)
-    length: Mapped[str] = mapped_column(String(20), nullable=True)
-    max_atmosphering_speed: Mapped[str] = mapped_column(String(40), nullable=True)
-    crew: Mapped[str] = mapped_column(String(40), nullable=True)
-    passengers: Mapped[str] = mapped_column(String(40), nullable=True)
-    cargo_capacity: Mapped[str] = mapped_column(String(40), nullable=True)
+    cost_in_credits: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    length: Mapped[float] = mapped_column(Float, nullable=True)
+    max_atmosphering_speed: Mapped[int] = mapped_column(Integer, nullable=True)
+    crew: Mapped[int] = mapped_column(Integer, nullable=True)
+    passengers: Mapped[int] = mapped_column(Integer, nullable=True)
+    cargo_capacity: Mapped[int] = mapped_column(BigInteger, nullable=True)
     consumables: Mapped[str] = mapped_column(String(40), nullable=True)
     vehicle_class: Mapped[str] = mapped_column(String(80), nullable=True)
 
+    @validates("cost_in_credits", "length", "max_atmosphering_speed", "crew", "passengers", "cargo_capacity")
+    def _validate_numbers(self, key, value):
+        return _swapi_number(self.__table__.c[key].type, value)
+
     # --- Relaciones ---
     # Relación con los usuarios que han marcado este vehículo como favorito
-    favorited_by: Mapped[List["FavoriteVehicle"]] = relationship("FavoriteVehicle", back_populates="vehicle", cascade="all, delete-orphan")
+    favorited_by: Mapped[List["User"]] = relationship("User", secondary=favorite_vehicles_table, back_populates="favorite_vehicles", passive_deletes=True)
 
     def __repr__(self):
         return f'<Vehicle {self.name}>'
 
-    def serialize(self):
-        """Convierte el objeto Vehicle a un diccionario simple."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "model": self.model,
-            "manufacturer": self.manufacturer,
-            "cost_in_credits": self.cost_in_credits,
-            "length": self.length,
-            "max_atmosphering_speed": self.max_atmosphering_speed,
-            "crew": self.crew,
-            "passengers": self.passengers,
-            "cargo_capacity": self.cargo_capacity,
-            "consumables": self.consumables,
-            "vehicle_class": self.vehicle_class,
-        }
-
-
-# --- Modelos de Asociación para Favoritos ---
-
-class FavoritePlanet(db.Model):
-    """
-    Modelo de asociación para registrar los planetas favoritos de cada usuario.
-    """
-    __tablename__ = "favorite_planets"
-
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
-    planet_id: Mapped[int] = mapped_column(Integer, ForeignKey("planets.id"), primary_key=True)
-
-    user: Mapped["User"] = relationship("User", back_populates="favorite_planets")
-    planet: Mapped["Planet"] = relationship("Planet", back_populates="favorited_by")
-
-    def __repr__(self):
-        return f'<FavoritePlanet User {self.user_id} -> Planet {self.planet_id}>'
-
-    def serialize(self):
-        """Convierte el objeto FavoritePlanet a un diccionario simple."""
-        return {
-            "user_id": self.user_id,
-            "planet_id": self.planet_id,
-        }
-
-class FavoritePerson(db.Model):
+    @classmethod
+    def loader_default(cls):
+        """Opciones de carga para la API: serialize() solo usa columnas, ninguna relación."""
+        return [raiseload("*")]
+
+    @classmethod
+    def loader_list(cls):
+        """Como Planet.loader_list(): listados sin serialize(), manufacturer no se pide."""
+        return [defer(cls.manufacturer, raiseload=True), raiseload("*")]
+
+_make_serializer(Vehicle, (
+    "id", "name", "model", "manufacturer", "cost_in_credits", "length", "max_atmosphering_speed",
+    "crew", "passengers", "cargo_capacity", "consumables", "vehicle_class",
+))
+
+
+# --- Consultas precompiladas ---
+# lambda_stmt guarda la sentencia en la caché de SQLAlchemy la primera vez, así las
+# búsquedas por ID no reconstruyen ni recompilan el SELECT en cada petición.
+# Uso: db.session.scalar(get_planet_by_id, {"pid": planet_id})
+get_planet_by_id = lambda_stmt(lambda: select(Planet).where(Planet.id == bindparam("pid")))
+get_person_by_id = lambda_stmt(lambda: select(Person).where(Person.id == bindparam("pid")))
+get_vehicle_by_id = lambda_stmt(lambda: select(Vehicle).where(Vehicle.id == bindparam("pid")))
+
+# --- Caché de lectura para datos de referencia ---
+# Planetas y vehículos casi nunca cambian: la versión serializada por ID se guarda en
+# memoria del proceso y cada llamada devuelve una copia, así que el llamador puede
+# modificarla sin afectar a los demás.
+# La caché se vacía cuando una sesión hace commit o rollback tras haber escrito planetas,
+# personas o vehículos (no en el flush: una lectura entre el flush y un rollback guardaría
+# datos que nunca existieron). Las escrituras que no pasan por una Session de SQLAlchemy
+# deben llamar a clear_read_caches().
+
+@lru_cache(maxsize=1024)
+def _cached_planet(pid):
+    planet = db.session.scalar(get_planet_by_id, {"pid": pid})
+    return planet.serialize() if planet else None
+
+@lru_cache(maxsize=1024)
+def _cached_vehicle(vid):
+    vehicle = db.session.scalar(get_vehicle_by_id, {"pid": vid})
+    return vehicle.serialize() if vehicle else None
+
+def get_planet_cached(pid: int) -> Optional[dict]:
+    data = _cached_planet(pid)
+    return {**data, "resident_ids": list(data["resident_ids"])} if data else None
+
+def get_vehicle_cached(vid: int) -> Optional[dict]:
+    data = _cached_vehicle(vid)
+    return dict(data) if data else None
+
+_READ_CACHES = {"planet": _cached_planet, "vehicle": _cached_vehicle}
+# Planet.serialize() incluye resident_ids, que depende de people
+_READ_CACHE_FOR_MODEL = {Planet: "planet", Person: "planet", Vehicle: "vehicle"}
+_STALE_CACHES_KEY = "stale_read_caches"
+
+def clear_read_caches(*names):
+    """Vacía las cachés indicadas ("planet", "vehicle") o todas si no se indica ninguna."""
+    for name in names or _READ_CACHES:
+        _READ_CACHES[name].cache_clear()
+
+def _mark_stale(session, model):
+    name = _READ_CACHE_FOR_MODEL.get(model)
+    if name is not None:
+        session.info.setdefault(_STALE_CACHES_KEY, set()).add(name)
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_writes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _mark_stale(session, type(obj))
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    # session.execute(update(Planet)...) y similares no pasan por el flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _mark_stale(orm_execute_state.session, mapper.class_)
+
+@event.listens_for(Session, "after_commit")
+def _clear_caches_after_commit(session):
+    clear_read_caches(*session.info.pop(_STALE_CACHES_KEY, ()))
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_caches_after_rollback(session, previous_transaction):
+    stale = session.info.get(_STALE_CACHES_KEY)
+    if stale:
+        clear_read_caches(*stale)
+        # Tras un rollback de un savepoint, la transacción exterior aún puede hacer commit
+        if not session.in_transaction():
+            session.info.pop(_STALE_CACHES_KEY)
+
+# --- Estructuras de salida (msgspec) ---
+# msgspec.json.encode lee los campos de estos Structs directamente en C: el objeto se
+# convierte a JSON en una sola pasada, sin el diccionario intermedio de serialize()
+# ni el recorrido posterior de jsonify. Uso: json_response([p.to_out() for p in planets])
+
+class PlanetOut(msgspec.Struct):
+    id: int
+    name: str
+    diameter: Optional[int]
+    rotation_period: Optional[int]
+    orbital_period: Optional[int]
+    gravity: Optional[str]
+    population: Optional[int]
+    climate: Optional[str]
+    terrain: Optional[str]
+    surface_water: Optional[float]
+    resident_ids: List[int]
+
+class PersonOut(msgspec.Struct):
+    id: int
+    name: str
+    height: Optional[int]
+    mass: Optional[float]
+    hair_color: Optional[str]
+    skin_color: Optional[str]
+    eye_color: Optional[str]
+    birth_year: Optional[str]
+    gender: Optional[str]
+    homeworld_id: Optional[int]
+
+class VehicleOut(msgspec.Struct):
+    id: int
+    name: str
+    model: str
+    manufacturer: str
+    cost_in_credits: Optional[int]
+    length: Optional[float]
+    max_atmosphering_speed: Optional[int]
+    crew: Optional[int]
+    passengers: Optional[int]
+    cargo_capacity: Optional[int]
+    consumables: Optional[str]
+    vehicle_class: Optional[str]
+
+_make_serializer(Planet, PlanetOut.__struct_fields__, name="to_out", factory=PlanetOut)
+_make_serializer(Person, PersonOut.__struct_fields__, name="to_out", factory=PersonOut)
+_make_serializer(Vehicle, VehicleOut.__struct_fields__, name="to_out", factory=VehicleOut)
+
+# --- Columnas para listados de solo lectura ---
+# Los listados piden directamente estas columnas: filas tupla, sin instancias ORM,
+# sin identity map ni relaciones. Las listas de IDs relacionados (resident_ids...)
+# no se incluyen; se obtienen en el detalle de cada objeto.
+PLANET_COLS = (
+    Planet.id, Planet.name, Planet.diameter, Planet.rotation_period, Planet.orbital_period,
+    Planet.gravity, Planet.population, Planet.climate, Planet.terrain, Planet.surface_water,
+)
+PERSON_COLS = (
+    Person.id, Person.name, Person.height, Person.mass, Person.hair_color, Person.skin_color,
+    Person.eye_color, Person.birth_year, Person.gender, Person.homeworld_id,
+)
+VEHICLE_COLS = (
+    Vehicle.id, Vehicle.name, Vehicle.model, Vehicle.manufacturer, Vehicle.cost_in_credits,
+    Vehicle.length, Vehicle.max_atmosphering_speed, Vehicle.crew, Vehicle.passengers,
+    Vehicle.cargo_capacity, Vehicle.consumables, Vehicle.vehicle_class,
+)
+PLANET_KEYS = tuple(col.key for col in PLANET_COLS)
+PERSON_KEYS = tuple(col.key for col in PERSON_COLS)
+VEHICLE_KEYS = tuple(col.key for col in VEHICLE_COLS)
+
+# Variantes resumidas para listados que no muestran climate/terrain ni manufacturer,
+# los textos más largos de cada fila. Ejemplo: rows_as_dicts(PLANET_SUMMARY_COLS, PLANET_SUMMARY_KEYS)
+PLANET_SUMMARY_COLS = tuple(col for col in PLANET_COLS if col.key not in ("climate", "terrain"))
+VEHICLE_SUMMARY_COLS = tuple(col for col in VEHICLE_COLS if col.key != "manufacturer")
+PLANET_SUMMARY_KEYS = tuple(col.key for col in PLANET_SUMMARY_COLS)
+VEHICLE_SUMMARY_KEYS = tuple(col.key for col in VEHICLE_SUMMARY_COLS)
+
+# Bundles equivalentes: cada fila trae un Row compacto accesible por atributo
+# (row.planet.name) en lugar de una instancia ORM con su InstanceState. Solo lectura;
+# las escrituras siguen usando las clases mapeadas.
+# Uso: db.session.execute(select(PlanetReadBundle)).all()
+PlanetReadBundle = Bundle("planet", *PLANET_COLS)
+PersonReadBundle = Bundle("person", *PERSON_COLS)
+VehicleReadBundle = Bundle("vehicle", *VEHICLE_COLS)
+
+def rows_as_dicts(columns, keys):
     """
-    Modelo de asociación para registrar los personajes favoritos de cada usuario.
+    Ejecuta select(*columns) y devuelve una lista de diccionarios lista para jsonify.
+    Ejemplo: rows_as_dicts(PLANET_COLS, PLANET_KEYS)
     """
-    __tablename__ = "favorite_people"
-
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
-    person_id: Mapped[int] = mapped_column(Integer, ForeignKey("people.id"), primary_key=True)
-
-    user: Mapped["User"] = relationship("User", back_populates="favorite_people")
-    person: Mapped["Person"] = relationship("Person", back_populates="favorited_by")
-
-    def __repr__(self):
-        return f'<FavoritePerson User {self.user_id} -> Person {self.person_id}>'
-
-    def serialize(self):
-        """Convierte el objeto FavoritePerson a un diccionario simple."""
-        return {
-            "user_id": self.user_id,
-            "person_id": self.person_id,
-        }
-
-# --- NUEVO: Modelo FavoriteVehicle ---
-class FavoriteVehicle(db.Model):
-    """
-    Modelo de asociación para registrar los vehículos favoritos de cada usuario.
-    Implementa la relación Muchos-a-Muchos entre User y Vehicle.
-    """
-    __tablename__ = "favorite_vehicles"
-
-    # Clave primaria compuesta
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
-    vehicle_id: Mapped[int] = mapped_column(Integer, ForeignKey("vehicles.id"), primary_key=True)
-    # added_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now()) # Opcional
-
-    # --- Relaciones ---
-    user: Mapped["User"] = relationship("User", back_populates="favorite_vehicles")
-    vehicle: Mapped["Vehicle"] = relationship("Vehicle", back_populates="favorited_by")
-
-    def __repr__(self):
-        return f'<FavoriteVehicle User {self.user_id} -> Vehicle {self.vehicle_id}>'
-
-    def serialize(self):
-        """Convierte el objeto FavoriteVehicle a un diccionario simple."""
-        return {
-            "user_id": self.user_id,
-            "vehicle_id": self.vehicle_id,
-            # Podrías serializar el objeto vehículo completo si es necesario
-            # "vehicle_details": self.vehicle.serialize() if self.vehicle else None
-        }
+    rows = db.session.execute(select(*columns)).all()
+    return [dict(zip(keys, row)) for row in rows]
 
 # --- Fin de los Modelos ---
 
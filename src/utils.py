@@ -1,4 +1,5 @@
-from flask import jsonify, url_for
+from flask import jsonify, url_for, Response
+import msgspec
 
 class APIException(Exception):
     status_code = 400
@@ -15,6 +16,10 @@ class APIException(Exception):
         rv['message'] = self.message
         return rv
 
+def json_response(payload, status_code=200):
+    # Codifica con msgspec (Structs como PlanetOut, listas, dicts) directamente a bytes, sin pasar por jsonify
+    return Response(msgspec.json.encode(payload), status=status_code, mimetype="application/json")
+
 def has_no_empty_params(rule):
     defaults = rule.defaults if rule.defaults is not None else ()
     arguments = rule.arguments if rule.arguments is not None else ()